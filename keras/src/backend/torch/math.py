@@ -12,19 +12,13 @@ from keras.src.backend.torch.numpy import pad
 
 
 def _segment_reduction_fn(data, segment_ids, reduction_method, num_segments):
-    num_repeats = torch.prod(
-        torch.tensor(data.shape[1:], device=get_device())
-    ).long()
-    # To use `scatter_add` in torch, we need to replicate `segment_ids` into the
-    # shape of `data`.
-    segment_ids = (
-        segment_ids.repeat_interleave(num_repeats)
-        .view(*data.shape)
-        .type(torch.int64)
-    )
-    num_segments = num_segments or len(torch.unique(segment_ids))
+    segment_ids = segment_ids.type(torch.int64)
+    if num_segments is None:
+        # Only the largest id is needed, which avoids sorting the ids and
+        # skips the device sync entirely when `num_segments` is given.
+        num_segments = segment_ids.max().item() + 1
 
-    # .scatter_add does not support -1 in the indices.
+    # The scatter ops used below do not support -1 in the indices.
     # Add all out-of-bound indices value to an extra dimension after
     # num_segments, which is removed before returning the result.
 
@@ -37,6 +31,24 @@ def _segment_reduction_fn(data, segment_ids, reduction_method, num_segments):
     # Add one more dimension to the result shape with the "+1".
     shape = (num_segments + 1,) + tuple(data.shape[1:])
 
+    if reduction_method == "sum":
+        # `index_add_` takes the 1-D `segment_ids` directly and supports
+        # integer dtypes, so no cast or replication of the indices is needed.
+        # 16-bit floats are still accumulated in float32 to keep precision.
+        compute_dtype = data.dtype
+        if compute_dtype in (torch.float16, torch.bfloat16):
+            compute_dtype = torch.float32
+        result = torch.zeros(shape, dtype=compute_dtype, device=data.device)
+        result.index_add_(0, segment_ids, data.type(compute_dtype))
+        # Removing the extra dimension.
+        return result[:-1, ...].type(data.dtype)
+
+    # To use `scatter_reduce` in torch, `segment_ids` needs the shape of
+    # `data`. Broadcast it as a view instead of replicating it in memory.
+    segment_ids = segment_ids.view((-1,) + (1,) * (data.dim() - 1)).expand(
+        data.shape
+    )
+
     if reduction_method == "amax":
         result = torch.ones(*shape, device=get_device()) * -float("Inf")
     else:
@@ -73,7 +85,8 @@ def in_top_k(targets, predictions, k):
     targets = convert_to_tensor(targets).type(torch.int64)
     targets = targets[:, None]
     predictions = convert_to_tensor(predictions)
-    topk_values = top_k(predictions, k).values
+    # The top k values are only compared against, so skip sorting them.
+    topk_values = torch.topk(predictions, k, sorted=False).values
     targets_values = torch.take_along_dim(predictions, targets, dim=-1)
     mask = targets_values >= topk_values
     return torch.any(mask, axis=-1)
@@ -93,7 +106,6 @@ def qr(x, mode="reduced"):
             "Expected one of {'reduced', 'complete'}. "
             f"Received: mode={mode}"
         )
-    x = convert_to_tensor(x)
     return torch.linalg.qr(x, mode=mode)
 
 
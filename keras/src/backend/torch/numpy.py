@@ -1675,9 +1675,9 @@ def correlate(x1, x2, mode="valid"):
         x1 = torch.broadcast_to(x1, new_shape + [x1.shape[-1]])
         x2 = torch.broadcast_to(x2, new_shape + [x2.shape[-1]])
 
-    num_signals = torch.tensor(x1.shape[:-1]).prod()
-    x1 = torch.reshape(x1, (int(num_signals), x1.size(-1)))
-    x2 = torch.reshape(x2, (int(num_signals), x2.size(-1)))
+    num_signals = math.prod(x1.shape[:-1])
+    x1 = torch.reshape(x1, (num_signals, x1.size(-1)))
+    x2 = torch.reshape(x2, (num_signals, x2.size(-1)))
 
     output = torch.nn.functional.conv1d(
         x1, x2.unsqueeze(1), groups=x1.size(0), padding=x2.size(-1) - 1
@@ -6,6 +6,9 @@ from keras.src.backend import KerasTensor
 from keras.src.backend.config import backend
 from keras.src.ops.operation import Operation
 
+# Maximum number of input signatures for which `Function` caches output specs.
+OUTPUT_SPEC_CACHE_SIZE = 128
+
 
 @keras_export("keras.Function")
 class Function(Operation):
@@ -56,6 +59,8 @@ class Function(Operation):
             self._self_setattr_tracking = False
         self._inputs_struct = tree.map_structure(lambda x: x, inputs)
         self._outputs_struct = tree.map_structure(lambda x: x, outputs)
+        # LRU cache of output specs, keyed by input shapes and dtypes.
+        self._output_spec_cache = collections.OrderedDict()
         self._inputs = tree.flatten(inputs)
         self._outputs = tree.flatten(outputs)
         if not self._inputs:
@@ -81,6 +86,83 @@ class Function(Operation):
         self._nodes_by_depth = nodes_by_depth
         self._operations = operations
         self._operations_by_depth = operations_by_depth
+        # The graph is immutable, so the order in which nodes get executed
+        # can be computed once: from inputs to outputs, skipping input nodes.
+        # Nodes that can't be computed from `inputs` are skipped too, e.g.
+        # the upstream producers of intermediate tensors used as inputs.
+        execution_order = []
+        computable_tensors = {id(x) for x in self._inputs}
+        for depth in sorted(nodes_by_depth.keys(), reverse=True):
+            for node in nodes_by_depth[depth]:
+                if not node.operation or node.is_input:
+                    continue
+                if any(
+                    id(x) not in computable_tensors for x in node.input_tensors
+                ):
+                    continue
+                execution_order.append(node)
+                computable_tensors.update(id(x) for x in node.outputs)
+        for x in self._outputs:
+            if id(x) not in computable_tensors:
+                raise ValueError(
+                    f"Graph disconnected: cannot compute output {x} from "
+                    f"inputs {self._inputs}."
+                )
+        self._execution_order = execution_order
+        # Give every tensor of the graph a slot in the list of computed
+        # values used by `_run_through_graph`. Slots are owned by the Function
+        # rather than by the tensors, which may be shared between Functions.
+        tensor_slots = {}
+
+        def get_slot(x):
+            return tensor_slots.setdefault(id(x), len(tensor_slots))
+
+        self._input_slots = [get_slot(x) for x in self._inputs]
+        node_slots = [
+            (
+                [get_slot(x) for x in node.input_tensors],
+                [get_slot(x) for x in node.outputs],
+            )
+            for node in self._execution_order
+        ]
+        self._output_slots = [get_slot(x) for x in self._outputs]
+        self._num_slots = len(tensor_slots)
+
+        # Liveness analysis: release each computed value right after the last
+        # node that uses it, so that intermediate tensors don't stay alive
+        # until the whole graph has run. Outputs are never released.
+        last_uses = {}
+        for i, (input_slots, output_slots) in enumerate(node_slots):
+            for slot in input_slots + output_slots:
+                last_uses[slot] = i
+        for slot in self._output_slots:
+            last_uses.pop(slot, None)
+        released_slots = [[] for _ in node_slots]
+        for slot, i in last_uses.items():
+            released_slots[i].append(slot)
+
+        # For each node: the node, a function resolving its call arguments
+        # from the computed values, its output slots, and the slots to
+        # release once it has run.
+        self._execution_plan = [
+            (
+                node,
+                node.arguments.make_fill_in_fn(input_slots),
+                output_slots,
+                released_slots[i],
+            )
+            for i, (node, (input_slots, output_slots)) in enumerate(
+                zip(self._execution_order, node_slots)
+            )
+        ]
+
+        # Rank and known (non-`None`) dimensions of each reference input,
+        # checked against the actual inputs in `_assert_input_compatibility`.
+        self._input_ranks = [len(x.shape) for x in self._inputs]
+        self._input_known_dims = [
+            [(i, dim) for i, dim in enumerate(x.shape) if dim is not None]
+            for x in self._inputs
+        ]
 
     @property
     def operations(self):
@@ -110,13 +192,49 @@ class Function(Operation):
                 lambda x: KerasTensor(shape=x.shape, dtype=x.dtype),
                 self._outputs_struct,
             )
+        # Check if these input shapes were seen before.
+        cache_key = self._output_spec_cache_key(inputs)
+        cached_specs = self._output_spec_cache.get(cache_key)
+        if cached_specs is not None:
+            self._output_spec_cache.move_to_end(cache_key)
+            return tree.pack_sequence_as(
+                self._outputs_struct,
+                [
+                    KerasTensor(shape=shape, dtype=dtype, sparse=sparse)
+                    for shape, dtype, sparse in cached_specs
+                ],
+            )
         # No luck; take the long road through the graph.
-        # Original Keras used a cache to avoid recomputing all this
-        # when known input shapes where seen again. Perhaps a good
-        # idea to bring that back.
-        return self._run_through_graph(
+        outputs = self._run_through_graph(
             inputs, operation_fn=lambda op: op.compute_output_spec
         )
+        self._output_spec_cache[cache_key] = [
+            (x.shape, x.dtype, x.sparse) for x in tree.flatten(outputs)
+        ]
+        if len(self._output_spec_cache) > OUTPUT_SPEC_CACHE_SIZE:
+            self._output_spec_cache.popitem(last=False)
+        return outputs
+
+    def _output_spec_cache_key(self, inputs):
+        """Returns the `_output_spec_cache` key for `inputs`.
+
+        The key only holds values (never object ids). Besides the input
+        signature, it includes the compute dtypes of all layers in the graph,
+        since dtype policies can be changed after the Function was built.
+        """
+        compute_dtypes = []
+        for operation in self._operations:
+            if hasattr(operation, "_flatten_layers"):
+                compute_dtypes.extend(
+                    layer.compute_dtype for layer in operation._flatten_layers()
+                )
+        return (
+            tuple(
+                (tuple(x.shape), x.dtype, x.sparse)
+                for x in tree.flatten(inputs)
+            ),
+            tuple(compute_dtypes),
+        )
 
     def compute_output_shape(self, input_shape):
         # Wrap `input_shape` into the structure of KerasTensor to utilize
@@ -145,39 +263,27 @@ class Function(Operation):
         """
         inputs = tree.flatten(inputs)
 
-        # Dictionary mapping reference tensors to computed tensors.
-        tensor_dict = {}
-        for x, y in zip(self.inputs, inputs):
-            tensor_dict[id(x)] = y
-
-        nodes_by_depth = self._nodes_by_depth
-        depth_keys = list(nodes_by_depth.keys())
-        depth_keys.sort(reverse=True)
-
-        for depth in depth_keys:
-            nodes = nodes_by_depth[depth]
-            for node in nodes:
-                if not node.operation or node.is_input:
-                    continue  # Input tensors already exist.
-
-                if any(id(x) not in tensor_dict for x in node.input_tensors):
-                    continue  # Node is not computable, try skipping.
-
-                args, kwargs = node.arguments.fill_in(tensor_dict)
-                op = operation_fn(node.operation)
-                if call_fn is not None:
-                    outputs = call_fn(op, *args, **kwargs)
-                else:
-                    outputs = op(*args, **kwargs)
-
-                # Update tensor_dict.
-                for x, y in zip(node.outputs, tree.flatten(outputs)):
-                    tensor_dict[id(x)] = y
-
-        output_tensors = []
-        for x in self.outputs:
-            output_tensors.append(tensor_dict[id(x)])
-
+        # List of computed tensors, indexed by the slots of reference tensors.
+        tensor_values = [None] * self._num_slots
+        for slot, y in zip(self._input_slots, inputs):
+            tensor_values[slot] = y
+
+        for node, fill_in_fn, output_slots, dead_slots in self._execution_plan:
+            args, kwargs = fill_in_fn(tensor_values)
+            op = operation_fn(node.operation)
+            if call_fn is not None:
+                outputs = call_fn(op, *args, **kwargs)
+            else:
+                outputs = op(*args, **kwargs)
+
+            # Update tensor_values.
+            for slot, y in zip(output_slots, tree.flatten(outputs)):
+                tensor_values[slot] = y
+            # Release values that no later node needs.
+            for slot in dead_slots:
+                tensor_values[slot] = None
+
+        output_tensors = [tensor_values[s] for s in self._output_slots]
         return tree.pack_sequence_as(self._outputs_struct, output_tensors)
 
     def _assert_input_compatibility(self, inputs):
@@ -191,23 +297,23 @@ class Function(Operation):
                 f"Expected input structure: {self._inputs_struct}\n"
                 f"Received input structure: {inputs}"
             )
-        for x, x_ref in zip(tree.flatten(inputs), self._inputs):
-            if len(x.shape) != len(x_ref.shape):
+        for x, x_ref, rank, known_dims in zip(
+            tree.flatten(inputs),
+            self._inputs,
+            self._input_ranks,
+            self._input_known_dims,
+        ):
+            shape = x.shape
+            if len(shape) != rank or any(
+                shape[i] is not None and shape[i] != ref_dim
+                for i, ref_dim in known_dims
+            ):
                 raise ValueError(
                     f"{self.__class__.__name__} was passed "
                     f"incompatible inputs. For input '{x_ref.name}', "
                     f"expected shape {x_ref.shape}, but received "
                     f"instead a tensor with shape {x.shape}."
                 )
-            for dim, ref_dim in zip(x.shape, x_ref.shape):
-                if ref_dim is not None and dim is not None:
-                    if dim != ref_dim:
-                        raise ValueError(
-                            f"{self.__class__.__name__} was passed "
-                            f"incompatible inputs. For input '{x_ref.name}', "
-                            f"expected shape {x_ref.shape}, but received "
-                            f"instead a tensor with shape {x.shape}."
-                        )
 
 
 def make_node_key(op, node_index):
@@ -292,7 +398,7 @@ def map_graph(inputs, outputs):
         operations_for_depth = operations_by_depth[depth]
         # Network.operations needs to have a deterministic order:
         # here we order them by traversal order.
-        operations_for_depth.sort(key=lambda x: operation_indices[x])
+        operations_for_depth.sort(key=operation_indices.__getitem__)
         operations.extend(operations_for_depth)
 
     # Get sorted list of node depths.
@@ -325,11 +431,13 @@ def map_graph(inputs, outputs):
 
     # Ensure name unicity, which will be crucial for serialization
     # (since serialized nodes refer to operations by their name).
-    all_names = [operation.name for operation in operations]
-    for name in all_names:
-        if all_names.count(name) != 1:
+    name_counts = collections.Counter(
+        operation.name for operation in operations
+    )
+    for name, count in name_counts.items():
+        if count != 1:
             raise ValueError(
-                f'The name "{name}" is used {all_names.count(name)} '
+                f'The name "{name}" is used {count} '
                 "times in the model. All operation names should be unique."
             )
     return network_nodes, nodes_by_depth, operations, operations_by_depth
@@ -361,6 +469,7 @@ def _build_map(inputs, outputs):
     nodes_in_progress = set()
     nodes_in_decreasing_depth = []  # nodes from inputs -> outputs.
     operation_indices = {}  # operation -> in traversal order.
+    inputs = tree.flatten(inputs)
     for output in tree.flatten(outputs):
         _build_map_helper(
             inputs,
@@ -381,45 +490,53 @@ def _build_map_helper(
     nodes_in_decreasing_depth,
     operation_indices,
 ):
-    """Recursive helper for `_build_map`."""
-    (
-        operation,
-        node_index,
-        _,
-    ) = tensor._keras_history
-    if not operation:
-        return
-
-    node = operation._inbound_nodes[node_index]
-
-    # Don't repeat work for shared subgraphs
-    if node in finished_nodes:
-        return
-
-    # Prevent cycles.
-    if node in nodes_in_progress:
-        raise ValueError(
-            f"Tensor {tensor} from operation '{operation.name}' is part of a "
-            "cycle."
-        )
+    """Iterative depth-first search helper for `_build_map`.
 
-    # Store the traversal order for operation sorting.
-    if operation not in operation_indices:
-        operation_indices[operation] = len(operation_indices)
-
-    # Propagate to all previous tensors connected to this node.
-    nodes_in_progress.add(node)
-    if not node.is_input and tensor not in tree.flatten(inputs):
-        for tensor in node.input_tensors:
-            _build_map_helper(
-                inputs,
-                tensor,
-                finished_nodes,
-                nodes_in_progress,
-                nodes_in_decreasing_depth,
-                operation_indices,
+    Uses an explicit stack rather than recursion, so that deep graphs don't
+    hit the Python recursion limit. Each stack entry is a `(tensor, node)`
+    pair: `node` is `None` when `tensor` is first visited, and is set to the
+    node that produced `tensor` once its parents have been pushed, so that
+    the node gets finished after all of them.
+    """
+    stack = [(tensor, None)]
+    while stack:
+        tensor, node = stack.pop()
+        if node is not None:
+            # All the parents of this node are finished.
+            finished_nodes.add(node)
+            nodes_in_progress.remove(node)
+            nodes_in_decreasing_depth.append(node)
+            continue
+
+        (
+            operation,
+            node_index,
+            _,
+        ) = tensor._keras_history
+        if not operation:
+            continue
+
+        node = operation._inbound_nodes[node_index]
+
+        # Don't repeat work for shared subgraphs
+        if node in finished_nodes:
+            continue
+
+        # Prevent cycles.
+        if node in nodes_in_progress:
+            raise ValueError(
+                f"Tensor {tensor} from operation '{operation.name}' is part "
+                "of a cycle."
             )
 
-    finished_nodes.add(node)
-    nodes_in_progress.remove(node)
-    nodes_in_decreasing_depth.append(node)
+        # Store the traversal order for operation sorting.
+        if operation not in operation_indices:
+            operation_indices[operation] = len(operation_indices)
+
+        # Propagate to all previous tensors connected to this node. They are
+        # pushed in reverse order so that they get visited in order.
+        nodes_in_progress.add(node)
+        stack.append((tensor, node))
+        if not node.is_input and tensor not in inputs:
+            for parent_tensor in reversed(node.input_tensors):
+                stack.append((parent_tensor, None))
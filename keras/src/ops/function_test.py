@@ -65,6 +65,36 @@ class FunctionTest(testing.TestCase):
         self.assertIsInstance(out, keras_tensor.KerasTensor)
         self.assertEqual(out.shape, (4, 3))
 
+    def test_output_spec_cache(self):
+        x = keras_tensor.KerasTensor((None, 3))
+        y = x**2
+        fn = function.Function(x, y)
+
+        out_1 = fn.compute_output_spec(keras_tensor.KerasTensor((4, 3)))
+        self.assertEqual(len(fn._output_spec_cache), 1)
+        out_2 = fn.compute_output_spec(keras_tensor.KerasTensor((4, 3)))
+        self.assertEqual(len(fn._output_spec_cache), 1)
+        self.assertIsNot(out_1, out_2)
+        self.assertEqual(out_2.shape, (4, 3))
+        self.assertEqual(out_2.dtype, out_1.dtype)
+
+        out_3 = fn.compute_output_spec(keras_tensor.KerasTensor((5, 3)))
+        self.assertEqual(len(fn._output_spec_cache), 2)
+        self.assertEqual(out_3.shape, (5, 3))
+
+        # Changing a dtype policy must not return stale cached specs.
+        x = Input(batch_shape=(None, 3))
+        layer = Dense(2)
+        fn = function.Function(x, layer(x))
+        out = fn.compute_output_spec(keras_tensor.KerasTensor((4, 3)))
+        self.assertEqual(out.dtype, "float32")
+
+        layer.dtype_policy = "bfloat16"
+        out = fn.compute_output_spec(keras_tensor.KerasTensor((4, 3)))
+        self.assertEqual(out.dtype, "bfloat16")
+        out = fn.compute_output_spec(keras_tensor.KerasTensor((7, 3)))
+        self.assertEqual(out.dtype, "bfloat16")
+
     def test_dict_io(self):
         x1 = keras_tensor.KerasTensor((2, 3))
         x2 = keras_tensor.KerasTensor((2, 3))
@@ -114,8 +144,60 @@ class FunctionTest(testing.TestCase):
             _ = fn([np.ones((4, 3)), np.ones((2, 3))])
 
     def test_graph_disconnected_error(self):
-        # TODO
-        pass
+        x1 = Input(shape=(3,))
+        x2 = Input(shape=(3,))
+        y = knp.add(x1, x2)
+        with self.assertRaisesRegex(ValueError, "Graph disconnected"):
+            _ = function.Function(inputs=x1, outputs=y)
+
+    def test_intermediate_inputs(self):
+        inputs = Input(shape=(3,))
+        x = Dense(4)(inputs)
+        outputs = Dense(2)(x)
+        fn = function.Function(inputs=x, outputs=outputs)
+        self.assertLen(fn._execution_order, 1)
+
+        y_val = fn(np.ones((1, 4)))
+        self.assertEqual(y_val.shape, (1, 2))
+
+    def test_intermediate_values_released(self):
+        x = keras_tensor.KerasTensor((2, 3))
+        a = knp.add(x, 1)
+        b = knp.multiply(a, 2)
+        y1 = knp.add(b, a)
+        y2 = knp.multiply(b, 3)
+        fn = function.Function(inputs=x, outputs=[b, y1, y2])
+
+        # `x` and `a` are released after their last use, outputs never are.
+        dead_slots = [slots for _, _, _, slots in fn._execution_plan]
+        self.assertEqual(sum(len(slots) for slots in dead_slots), 2)
+        for slots in dead_slots:
+            for slot in slots:
+                self.assertNotIn(slot, fn._output_slots)
+
+        y_val = fn(np.ones((2, 3)))
+        self.assertAllClose(y_val[0], np.ones((2, 3)) * 4)
+        self.assertAllClose(y_val[1], np.ones((2, 3)) * 6)
+        self.assertAllClose(y_val[2], np.ones((2, 3)) * 12)
+
+    def test_deep_graph(self):
+        # Deeper than the default Python recursion limit.
+        x = keras_tensor.KerasTensor((2, 3))
+        y = x
+        for _ in range(5000):
+            y = knp.add(y, 1)
+        fn = function.Function(inputs=x, outputs=y)
+        self.assertLen(fn.operations, 5000)
+
+        y_val = fn(np.zeros((2, 3)))
+        self.assertAllClose(y_val, np.ones((2, 3)) * 5000)
+
+    def test_duplicate_operation_names_error(self):
+        inputs = Input(shape=(10,))
+        x = Dense(4, name="dense")(inputs)
+        outputs = Dense(1, name="dense")(x)
+        with self.assertRaisesRegex(ValueError, '"dense" is used 2 times'):
+            _ = function.Function(inputs=inputs, outputs=outputs)
 
     def test_serialization(self):
         inputs = Input(shape=(10,))
@@ -597,6 +597,27 @@ class MathOpsCorrectnessTest(testing.TestCase):
             sorted_indices=sorted_indices,
         )
 
+    @parameterized.parameters(["float16", "bfloat16"])
+    def test_segment_sum_low_precision(self, dtype):
+        data = backend.convert_to_tensor(np.ones((4, 3)), dtype=dtype)
+        segment_ids = np.array([0, 1, 1, 1], dtype=np.int32)
+        outputs = kmath.segment_sum(data, segment_ids, num_segments=2)
+        self.assertEqual(backend.standardize_dtype(outputs.dtype), dtype)
+        self.assertAllClose(outputs, [[1, 1, 1], [3, 3, 3]])
+
+    @pytest.mark.skipif(
+        backend.backend() != "torch",
+        reason="Only the torch backend accumulates 16-bit floats in float32.",
+    )
+    def test_segment_sum_low_precision_accumulation(self):
+        # Past 256, bfloat16 can't represent `x + 1`: a sum accumulated in
+        # bfloat16 would get stuck there.
+        data = backend.convert_to_tensor(np.ones((512,)), dtype="bfloat16")
+        segment_ids = np.zeros((512,), dtype=np.int32)
+        outputs = kmath.segment_sum(data, segment_ids, num_segments=1)
+        self.assertEqual(backend.standardize_dtype(outputs.dtype), "bfloat16")
+        self.assertAllClose(outputs, [512])
+
     def test_top_k(self):
         x = np.array([0, 4, 2, 1, 3, -1], dtype=np.float32)
         values, indices = kmath.top_k(x, k=2)
@@ -669,6 +690,30 @@ class MathOpsCorrectnessTest(testing.TestCase):
             kmath.in_top_k(targets, predictions, k=2), [False, True]
         )
 
+        # Test `nan` in predictions, outside of the target position.
+        targets = np.array([2, 0])
+        predictions = np.array([[np.nan, 0.4, 0.5], [0.3, 0.2, 0.5]])
+        self.assertAllEqual(
+            kmath.in_top_k(targets, predictions, k=2), [True, True]
+        )
+
+    @pytest.mark.skipif(
+        backend.backend() == "numpy",
+        reason="`np.argpartition` selects all values when `k=0`.",
+    )
+    def test_in_top_k_zero_k(self):
+        targets = np.array([1, 0, 2])
+        predictions = np.array(
+            [
+                [0.1, 0.9, 0.8, 0.7],
+                [0.05, 0.95, 0, 1],
+                [0.1, 0.8, 0.3, 1],
+            ]
+        )
+        self.assertAllEqual(
+            kmath.in_top_k(targets, predictions, k=0), [False, False, False]
+        )
+
     def test_logsumexp(self):
         x = np.random.rand(5, 5)
         outputs = kmath.logsumexp(x)
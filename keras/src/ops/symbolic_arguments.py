@@ -44,3 +44,70 @@ class SymbolicArguments:
             return x
 
         return self.convert(switch_fn)
+
+    def fill_in_slots(self, tensor_values, slots):
+        """Maps KerasTensors to computed values using slot indices.
+
+        `slots` holds, for each entry of `self.keras_tensors`, the index of
+        its current value in the `tensor_values` list.
+        """
+        if self._single_positional_tensor is not None:
+            # Performance optimization for most common case.
+            return (tensor_values[slots[0]],), {}
+
+        slots = iter(slots)
+
+        def switch_fn(x):
+            if isinstance(x, KerasTensor):
+                return tensor_values[next(slots)]
+            return x
+
+        return self.convert(switch_fn)
+
+    def make_fill_in_fn(self, slots):
+        """Returns a function equivalent to `fill_in_slots` for fixed `slots`.
+
+        The structure of the arguments is resolved once here, so that calling
+        the returned function on `tensor_values` only does list indexing in
+        the common case where no argument is a nested structure.
+        """
+        if self._single_positional_tensor is not None:
+            slot = slots[0]
+            return lambda tensor_values: ((tensor_values[slot],), {})
+
+        if any(tree.is_nested(x) for x in self.args) or any(
+            tree.is_nested(x) for x in self.kwargs.values()
+        ):
+            return lambda tensor_values: self.fill_in_slots(
+                tensor_values, slots
+            )
+
+        # Flattening visits positional arguments first, then keyword
+        # arguments sorted by key.
+        slots = iter(slots)
+        args = [
+            (x, next(slots) if isinstance(x, KerasTensor) else None)
+            for x in self.args
+        ]
+        kwarg_slots = {
+            key: next(slots)
+            for key in sorted(self.kwargs)
+            if isinstance(self.kwargs[key], KerasTensor)
+        }
+        kwargs = [
+            (key, x, kwarg_slots.get(key)) for key, x in self.kwargs.items()
+        ]
+
+        def fill_in_fn(tensor_values):
+            return (
+                tuple(
+                    x if slot is None else tensor_values[slot]
+                    for x, slot in args
+                ),
+                {
+                    key: x if slot is None else tensor_values[slot]
+                    for key, x, slot in kwargs
+                },
+            )
+
+        return fill_in_fn
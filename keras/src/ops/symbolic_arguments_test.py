@@ -119,3 +119,43 @@ class SymbolicArgumentsTest(testing.TestCase):
 
         (values, _) = sym_args.fill_in(dictionary)
         self.assertEqual(values, ((3, None), {"1": 2}))
+
+    # Testing fill in function using slot indices
+    def test_fill_in_slots(self):
+        shape1 = (2, 3, 4)
+        shape2 = (3, 2, 4)
+        a = KerasTensor(shape=shape1)
+        b = KerasTensor(shape=shape2)
+        c = KerasTensor(shape=shape2)
+        tensor_values = [1, 2, 3]
+        sym_args = SymbolicArguments((a, 4, b), {"1": c})
+
+        (values, _) = sym_args.fill_in_slots(tensor_values, [2, 0, 1])
+        self.assertEqual(values, ((3, 4, 1), {"1": 2}))
+
+    # Testing precomputed fill in function
+    def test_make_fill_in_fn(self):
+        shape = (2, 3, 4)
+        a = KerasTensor(shape=shape)
+        b = KerasTensor(shape=shape)
+        c = KerasTensor(shape=shape)
+        tensor_values = [1, 2, 3]
+
+        sym_args = SymbolicArguments(a)
+        fill_in_fn = sym_args.make_fill_in_fn([1])
+        self.assertEqual(fill_in_fn(tensor_values), ((2,), {}))
+
+        sym_args = SymbolicArguments(a, 4, b, y=c, x=None)
+        fill_in_fn = sym_args.make_fill_in_fn([2, 0, 1])
+        self.assertEqual(
+            fill_in_fn(tensor_values), ((3, 4, 1), {"y": 2, "x": None})
+        )
+        self.assertEqual(
+            fill_in_fn(tensor_values),
+            sym_args.fill_in_slots(tensor_values, [2, 0, 1]),
+        )
+
+        # Nested structures fall back to `fill_in_slots`.
+        sym_args = SymbolicArguments([a, 4], {"1": b})
+        fill_in_fn = sym_args.make_fill_in_fn([2, 0])
+        self.assertEqual(fill_in_fn(tensor_values), (([3, 4], {"1": 1}), {}))